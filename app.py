@@ -9,6 +9,7 @@ Eventbrite チケット自動予約システム(最終盤)
 使い方：
 1. 初回実行時：ブラウザが開くのでEventbriteにログイン
 2. ログイン後、Enterキーを押すと監視開始
+   （2回目以降はログイン状態が残っていれば自動で監視開始）
 3. 空き枠が見つかると自動的に予約処理を実行
 4. 最後のチェックアウトは手動で完了
 
@@ -17,12 +18,18 @@ Eventbrite チケット自動予約システム(最終盤)
 - ブラウザは監視中も開いたままにしておくこと
 """
 
-import requests
+import httpx
 import time
 import webbrowser  # デフォルトブラウザでURLを開くために使用
-import json
+import orjson
 import os
+import random
+import hashlib
+import threading
+import atexit
+from collections import deque, namedtuple, OrderedDict
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -51,12 +58,23 @@ TARGET_TICKET_CLASS_ID = None
 # 注意：1.0秒以下にするとAPI制限に引っかかりBANされる可能性があります（計算上1.8がlimit）
 POLL_INTERVAL = 1.8
 
+# API制限（429）やサーバーエラー（5xx）を検出した際のバックオフ設定（秒）
+# エラーが続くたびに待機時間が倍になり、BACKOFF_MAXで頭打ちになります
+# 成功が続くと待機時間は徐々にPOLL_INTERVALへ戻ります
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 60.0
+BACKOFF_JITTER = 1.0
+
 # チケット購入ページのベースURL
 CHECKOUT_BASE_URL = f'https://www.eventbrite.com/e/{EVENT_ID}'
 
 # API応答をJSONファイルに保存するかどうか（1: 保存する, 0: 保存しない）
 SAVE_JSON_RESPONSE = 0
 
+# 保存するJSONファイルの最大数（古いものから削除されます）
+# チケットの状態が変化したときのみ保存します
+SAVE_JSON_HISTORY = 20
+
 # 並列取得を有効化するかどうか（1: 有効, 0: 無効）
 # 有効にすると高速ですが、API負荷が高くなります
 ENABLE_PARALLEL_FETCH = 1
@@ -68,6 +86,22 @@ EARLY_EXIT = 0
 # 多いほど高速ですが、API制限に注意が必要です
 MAX_WORKERS = 10
 
+# ページ数（pagination.page_count）をキャッシュする時間（秒）
+# キャッシュが有効な間は1ページ目を待たずに全ページを並列取得します
+PAGE_COUNT_CACHE_TTL = 300
+
+# デバッグ出力を有効化するかどうか（1: 有効, 0: 無効）
+# 有効にすると予約処理中にスクリーンショットやボタン一覧を出力しますが、その分遅くなります
+DEBUG = 0
+
+# 監視中にブラウザから予約ページへの接続を温め直す間隔（秒）
+# Chromeはアイドル状態の接続を閉じるため、空き枠検出時にDNS・TLSからやり直さないようにします
+CHECKOUT_WARM_INTERVAL = 30
+
+# Chromeのプロファイル保存先
+# ログイン状態（Cookie）がここに保存され、次回以降の起動でも引き継がれます
+CHROME_PROFILE_DIR = os.path.join(os.getcwd(), '.chrome_profile')
+
 # Discord Webhook URL（.envファイルから読み込み）
 # 通知が不要な場合は .env ファイルで空欄にしておく
 DISCORD_WEBHOOK_URL = os.getenv('DISCORD_WEBHOOK_URL') or None
@@ -79,12 +113,111 @@ DISCORD_WEBHOOK_URL = os.getenv('DISCORD_WEBHOOK_URL') or None
 # Eventbrite API のベースURL
 BASE_URL = 'https://www.eventbriteapi.com/v3'
 
-# HTTPセッション（コネクションを再利用して高速化）
-session = requests.Session()
-session.headers.update({
-    'Authorization': f'Bearer {API_TOKEN}',
-    'Content-Type': 'application/json'
-})
+# チケットクラス一覧のエンドポイント（起動時に一度だけ作成）
+TICKET_CLASSES_URL = f'{BASE_URL}/events/{EVENT_ID}/ticket_classes/'
+
+# HTTPクライアント（コネクションを再利用して高速化）
+# HTTP/2で接続し、並列取得の全ページを1本のTCP/TLS接続に多重化する
+# （サーバーがHTTP/2に対応していない場合はHTTP/1.1のコネクションプールで動作）
+# 429や5xxはここでは再試行せず、fetch_page側のバックオフだけで処理する
+# httpxの既定はリダイレクトを追わず5秒でタイムアウトするため、以前のrequestsと同様に
+# リダイレクトを追い、遅い応答でも監視が止まらないよう長めのタイムアウトを指定する
+session = httpx.Client(
+    http2=True,
+    follow_redirects=True,
+    timeout=httpx.Timeout(30.0, connect=10.0),
+    headers={
+        'Authorization': f'Bearer {API_TOKEN}',
+        'Content-Type': 'application/json'
+    },
+    limits=httpx.Limits(max_connections=MAX_WORKERS, max_keepalive_connections=MAX_WORKERS)
+)
+
+# ページ並列取得用のスレッドプール
+# ポーリングのたびにスレッドを作り直さず、プログラム全体で使い回す
+fetch_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+
+# Discord通知用のHTTPセッションとスレッド
+# 通知の送信を予約処理と並行して行い、終了時に未送信の通知を送り切る
+discord_session = httpx.Client(limits=httpx.Limits(max_connections=1))
+discord_executor = ThreadPoolExecutor(max_workers=1)
+atexit.register(discord_executor.shutdown, wait=True)
+
+# ============================================================
+# Seleniumセレクタ設定
+# ============================================================
+
+# 各ステップで探す要素のロケーター
+# 複数のセレクタはカンマでまとめ、1回の待機でどれか1つに一致すれば進みます
+# （ページ構造の変更に対応するため、CSSで見つからない場合に備えてXPathも併用）
+
+# "Check availability"ボタン
+CHECK_AVAILABILITY_LOCATORS = [
+    (By.CSS_SELECTOR, "button[id*='check-availability'], button.check-availability-btnbutton"),
+    (By.XPATH, "//button[contains(text(), 'Check availability')] | //button[contains(@id, 'check-availability')]")
+]
+
+# 時間スロット
+TIME_SLOT_LOCATORS = [
+    (By.CSS_SELECTOR, "div[role='button'][class*='TimeSlot'], div.TimeSlot-moduleslot_1Z-Kw, div[class*='timeSlotContainer']")
+]
+
+# "Register"ボタン
+REGISTER_LOCATORS = [
+    (By.CSS_SELECTOR, "button[data-testid='eds-modal__primary-button'], button[data-automation='eds-modalprimary-button'], button.eds-btn--fill"),
+    (By.XPATH, "//button[contains(text(), 'Register')]")
+]
+
+# 利用可能な日付が表示されるまで待つ秒数
+DATE_WAIT_TIMEOUT = 20
+
+# 利用可能な日付の要素が描画されるまでブラウザ側で待つJavaScript（execute_async_script用）
+# すでに描画済みならすぐに返し、まだならMutationObserverでDOMの変化を監視して
+# 描画された瞬間に返します（タイムアウト時はnullを返す）
+# 探す順番：
+# 1. 日付テキスト（p.dateText）を持ち、unavailable/disabledでない表示中のli
+# 2. enabledクラスを持つ表示中のli
+# 3. カレンダー領域（table/grid/calendar）内の数字だけのボタン
+WAIT_FOR_AVAILABLE_DATE_SCRIPT = """
+const timeoutMs = arguments[0];
+const done = arguments[arguments.length - 1];
+const isVisible = el => el.offsetParent !== null;
+const isDate = text => /^\\d{1,2}$/.test((text || '').trim());
+const findDate = () => {
+    const items = [...document.querySelectorAll('li')];
+    for (const li of items) {
+        const p = li.querySelector('p.dateText');
+        if (isVisible(li) && p && isDate(p.innerText) && !/unavailable|disabled/i.test(li.className)) return li;
+    }
+    for (const li of items) {
+        if (isVisible(li) && /enabled/i.test(li.className)) return li;
+    }
+    const buttons = document.querySelectorAll("table button, [role='grid'] button, [class*='calendar'] button");
+    for (const btn of buttons) {
+        if (isVisible(btn) && !btn.disabled && isDate(btn.innerText)) return btn;
+    }
+    return null;
+};
+const found = findDate();
+if (found) {
+    done(found);
+    return;
+}
+let timer = null;
+const observer = new MutationObserver(() => {
+    const el = findDate();
+    if (el) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done(el);
+    }
+});
+observer.observe(document.body, {childList: true, subtree: true, attributes: true, attributeFilter: ['class']});
+timer = setTimeout(() => {
+    observer.disconnect();
+    done(null);
+}, timeoutMs);
+"""
 
 # ============================================================
 # グローバル変数
@@ -93,6 +226,42 @@ session.headers.update({
 # APIリクエストのカウンター（デバッグ用）
 request_counter = 0
 
+# 連続したAPIエラー（429/5xx）の回数
+consecutive_failures = 0
+
+# 次のチェックまでの待機時間（秒）
+current_interval = POLL_INTERVAL
+
+# バックオフ状態を更新する際のロック（並列取得のスレッド間で共有）
+backoff_lock = threading.Lock()
+
+# fetch_pageがAPI制限・サーバーエラーを検出した場合に返す値
+# （ステータスコードとRetry-Afterヘッダーの待機秒数）
+RateLimited = namedtuple('RateLimited', ['status_code', 'retry_after'])
+
+# 条件付きGET用のキャッシュ（キーはページ番号）
+# validator_cache: 前回応答のETag/Last-Modifiedから作ったリクエストヘッダー
+# page_cache: 前回応答のJSON（304 Not Modified時に再利用）
+validator_cache = {}
+page_cache = {}
+
+# 応答本文のハッシュ値 → 解析済みJSON のキャッシュ（古いものから削除）
+# 304が返らなくても本文が同じならJSONの解析を省略する
+BODY_CACHE_SIZE = 64
+body_cache = OrderedDict()
+body_cache_lock = threading.Lock()
+
+# 今回のチェックで内容が更新されたページ番号
+modified_pages = set()
+
+# キャッシュしたページ数と、キャッシュした時刻（time.monotonic()）
+cached_page_count = None
+page_count_cached_at = 0.0
+
+# 最後に保存したチケット状態のフィンガープリントと、保存済みJSONファイル
+last_fingerprint = None
+saved_json_files = deque()
+
 # ============================================================
 # Discord通知関連の関数
 # ============================================================
@@ -102,6 +271,7 @@ def send_discord_notification(message, event_url=None):
     Discord Webhookで通知を送信
 
     空き枠が見つかった際にDiscordに通知を送ります。
+    送信はバックグラウンドで行うため、この関数はすぐに戻ります。
     DISCORD_WEBHOOK_URLが設定されていない場合は何もしません。
 
     Args:
@@ -132,8 +302,21 @@ def send_discord_notification(message, event_url=None):
             "embeds": [embed]
         }
 
-        # Webhookに送信
-        response = requests.post(DISCORD_WEBHOOK_URL, json=payload)
+        # Webhookへの送信はバックグラウンドで行い、呼び出し元を待たせない
+        discord_executor.submit(post_discord_payload, payload)
+
+    except Exception as e:
+        print(f"⚠ Failed to send Discord notification: {e}")
+
+def post_discord_payload(payload):
+    """
+    Discord Webhookにペイロードを送信（discord_executorのスレッドで実行）
+
+    Args:
+        payload: Webhookに送信するJSON
+    """
+    try:
+        response = discord_session.post(DISCORD_WEBHOOK_URL, json=payload, timeout=5)
 
         if response.status_code == 204:
             print("✓ Discord notification sent successfully")
@@ -147,49 +330,256 @@ def send_discord_notification(message, event_url=None):
 # APIリクエスト関連の関数
 # ============================================================
 
-def fetch_page(url, page):
+def parse_retry_after(value):
     """
-    指定されたページのチケット情報を取得
+    Retry-Afterヘッダーの値を待機秒数に変換
 
     Args:
-        url: APIエンドポイントのURL
-        page: 取得するページ番号
+        value: Retry-Afterヘッダーの値（秒数またはHTTP日付）
 
     Returns:
-        dict: API応答のJSON（取得失敗時はNone）
+        float: 待機秒数（解釈できない場合はNone）
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def register_api_failure(retry_after):
+    """
+    API制限・サーバーエラーで失敗したチェックを記録して次回の待機時間を延ばす
+
+    1回のチェックにつき1回だけ呼び出します。
+    Retry-Afterヘッダーがあればその値を優先し、なければ
+    指数バックオフ（ジッター付き）で待機時間を計算します。
+
+    Args:
+        retry_after: Retry-Afterヘッダーの待機秒数（ない場合はNone）
+
+    Returns:
+        tuple: (次のチェックまでの待機時間（秒）, 連続エラーの1回目かどうか)
+    """
+    global consecutive_failures, current_interval
+    with backoff_lock:
+        consecutive_failures += 1
+        if retry_after is None:
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (consecutive_failures - 1))
+            delay += random.uniform(0, BACKOFF_JITTER)
+        else:
+            delay = retry_after
+        current_interval = max(current_interval, delay)
+        return current_interval, consecutive_failures == 1
+
+def handle_rate_limit(rate_limited):
+    """
+    API制限・サーバーエラーで失敗したチェックを処理
+
+    待機時間を延ばし、連続エラーの1回目が429だった場合はDiscordに通知します。
+
+    Args:
+        rate_limited: fetch_pageが返したRateLimited
+    """
+    delay, first_failure = register_api_failure(rate_limited.retry_after)
+    print(f"⚠ API error ({rate_limited.status_code}), backing off for {delay:.1f}s")
+
+    if rate_limited.status_code == 429 and first_failure:
+        error_message = f"⚠ API制限エラー（429）\n\nEventbrite APIのレート制限に達しました。\nPOLL_INTERVAL: {POLL_INTERVAL}秒\n\n{delay:.1f}秒待機してから監視を再開します。"
+        send_discord_notification(error_message, None)
+
+def register_api_success():
+    """
+    チェック成功を記録して待機時間をPOLL_INTERVALへ近づける
+    """
+    global consecutive_failures, current_interval
+    with backoff_lock:
+        consecutive_failures = 0
+        current_interval = max(POLL_INTERVAL, current_interval / 2)
+
+def parse_json_body(content):
+    """
+    応答本文をJSONとして解析（同じ本文は解析済みの結果を再利用）
+
+    Args:
+        content: 応答本文のバイト列
+
+    Returns:
+        dict: 解析済みのJSON
 
     Raises:
-        SystemExit: ステータスコード429（API制限）を検出した場合
+        ValueError: 本文がJSONとして解析できない場合（orjson.JSONDecodeError）
+    """
+    digest = hashlib.blake2b(content, digest_size=16).digest()
+    with body_cache_lock:
+        data = body_cache.get(digest)
+        if data is not None:
+            body_cache.move_to_end(digest)
+            return data
+
+    data = orjson.loads(content)
+    with body_cache_lock:
+        body_cache[digest] = data
+        while len(body_cache) > BODY_CACHE_SIZE:
+            body_cache.popitem(last=False)
+    return data
+
+def fetch_page(page):
+    """
+    指定されたページのチケット情報を取得
+
+    Args:
+        page: 取得するページ番号
+
+    Returns:
+        dict: API応答のJSON（取得失敗時はNone、
+              API制限・サーバーエラー時はRateLimited）
     """
     global request_counter
     request_counter += 1
     print(f"[Request #{request_counter}] Fetching page {page}...")
-    params = {'page': page}
-    response = session.get(url, params=params)
 
-    # API制限（Rate Limit）のチェック
-    if response.status_code == 429:
-        print("\n" + "=" * 60)
-        print("⚠ API制限エラー（429 Too Many Requests）")
-        print("=" * 60)
-        print("Eventbrite APIのレート制限に達しました。")
-        print("POLL_INTERVALの値を大きくしてください。")
-        print(f"現在の設定: {POLL_INTERVAL}秒")
-        print("推奨: 2.0秒以上")
-        print("=" * 60)
+    # 前回の応答にETag/Last-Modifiedがあれば条件付きGETにする
+    headers = validator_cache.get(page, {}) if page in page_cache else {}
+    response = session.get(f'{TICKET_CLASSES_URL}?page={page}', headers=headers)
 
-        # Discord通知を送信
-        error_message = f"⚠ API制限エラー（429）\n\nEventbrite APIのレート制限に達しました。\nPOLL_INTERVAL: {POLL_INTERVAL}秒\n\nプログラムを停止します。"
-        send_discord_notification(error_message, None)
+    # API制限（Rate Limit）・サーバーエラーのチェック
+    # （待機時間の更新は呼び出し元がチェック1回につき1回だけ行う）
+    if response.status_code == 429 or response.status_code >= 500:
+        return RateLimited(response.status_code, parse_retry_after(response.headers.get('Retry-After')))
 
-        # プログラムを終了
-        exit(1)
+    # 前回から変更なし（304）の場合はキャッシュ済みのJSONを返す
+    if response.status_code == 304 and page in page_cache:
+        return page_cache[page]
 
     if response.status_code == 200:
-        return response.json()
+        try:
+            data = parse_json_body(response.content)
+        except ValueError as e:
+            # HTMLのエラーページなどJSONでない本文が200で返った場合は取得失敗として扱う
+            print(f"⚠ Invalid JSON response for page {page}: {e}")
+            return None
+
+        validators = {}
+        if response.headers.get('ETag'):
+            validators['If-None-Match'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            validators['If-Modified-Since'] = response.headers['Last-Modified']
+        validator_cache[page] = validators
+        # 本文が前回と同じ場合は同じオブジェクトが返るので、変更なしとみなす
+        if page_cache.get(page) is not data:
+            modified_pages.add(page)
+        page_cache[page] = data
+        return data
 
     return None
 
+def cache_page_count(page_count):
+    """
+    ページ数をキャッシュする
+
+    Args:
+        page_count: APIが返したpagination.page_count
+    """
+    global cached_page_count, page_count_cached_at
+    cached_page_count = page_count
+    page_count_cached_at = time.monotonic()
+
+def get_cached_page_count():
+    """
+    キャッシュ済みのページ数を取得
+
+    Returns:
+        int: ページ数（未取得またはPAGE_COUNT_CACHE_TTLを過ぎている場合はNone）
+    """
+    if cached_page_count is None:
+        return None
+    if time.monotonic() - page_count_cached_at > PAGE_COUNT_CACHE_TTL:
+        return None
+    return cached_page_count
+
+def ticket_fingerprint(ticket_classes):
+    """
+    チケットの状態（IDと販売ステータス）からフィンガープリントを計算
+
+    Args:
+        ticket_classes: チケットクラスのリスト
+
+    Returns:
+        bytes: 8バイトのハッシュ値
+    """
+    h = hashlib.blake2b(digest_size=8)
+    for tc_id, status in sorted((str(tc.get('id')), str(tc.get('on_sale_status'))) for tc in ticket_classes):
+        h.update(f'{tc_id}:{status}\n'.encode())
+    return h.digest()
+
+def save_json_response(all_ticket_classes, all_responses):
+    """
+    API応答をJSONファイルに保存
+
+    チケットの状態が前回保存時から変わっていない場合は何もしません。
+    保存したファイルはSAVE_JSON_HISTORY件まで残し、古いものから削除します。
+
+    Args:
+        all_ticket_classes: 全ページのチケットクラス
+        all_responses: 各ページのAPI応答
+    """
+    global last_fingerprint
+    fingerprint = ticket_fingerprint(all_ticket_classes)
+    if fingerprint == last_fingerprint:
+        return
+    last_fingerprint = fingerprint
+
+    timestamp = time.strftime('%Y%m%d_%H%M%S')
+    filename = f'response_{timestamp}.json'
+    with open(filename, 'wb') as f:
+        f.write(orjson.dumps({
+            'total_tickets': len(all_ticket_classes),
+            'pages': len(all_responses),
+            'responses': all_responses
+        }))
+
+    if not saved_json_files or saved_json_files[-1] != filename:
+        saved_json_files.append(filename)
+    while len(saved_json_files) > SAVE_JSON_HISTORY:
+        try:
+            os.remove(saved_json_files.popleft())
+        except OSError:
+            pass
+
+def find_first_available(tickets):
+    """
+    販売中（AVAILABLE）のチケットを1件だけ探す
+
+    Args:
+        tickets: チケットクラスのリスト
+
+    Returns:
+        dict: 最初に見つかった販売中のチケット（なければNone）
+    """
+    return next((tc for tc in tickets if tc.get('on_sale_status') == 'AVAILABLE'), None)
+
+def collect_available_tickets(tickets):
+    """
+    販売中（AVAILABLE）のチケットをすべて取り出す
+
+    Args:
+        tickets: チケットクラスのリスト
+
+    Returns:
+        list: 販売中のチケット（id, name, on_sale_status）のリスト
+    """
+    return [{
+        'id': tc['id'],
+        'name': tc['name'],
+        'on_sale_status': tc['on_sale_status']
+    } for tc in tickets if tc.get('on_sale_status') == 'AVAILABLE']
+
 def check_ticket_availability():
     """
     イベントのチケット空き状況をチェック
@@ -200,134 +590,144 @@ def check_ticket_availability():
     Returns:
         bool: チケットが利用可能な場合True、そうでない場合False
     """
-    url = f'{BASE_URL}/events/{EVENT_ID}/ticket_classes/'
+    modified_pages.clear()
     try:
         all_ticket_classes = []
         all_responses = []
         available_tickets = []
 
+        # 取得に失敗した（API制限・サーバーエラー以外の）ページ数
+        failed_pages = 0
+
         if ENABLE_PARALLEL_FETCH:
-            # 完全並列取得: 1ページ目も並列で取得してページ数を把握
-            first_page = fetch_page(url, 1)
-            if not first_page:
-                print(f"Error: Failed to fetch first page")
-                return False
-
-            all_responses.append(first_page)
-            all_ticket_classes.extend(first_page.get('ticket_classes', []))
-
-            # 早期終了: 1ページ目で在庫チェック
-            if EARLY_EXIT:
-                for tc in first_page.get('ticket_classes', []):
-                    if tc.get('on_sale_status') == 'AVAILABLE':
-                        available_tickets.append({
-                            'id': tc['id'],
-                            'name': tc['name'],
-                            'on_sale_status': tc['on_sale_status']
-                        })
-
-                # 1ページ目で在庫発見したら即座に返す
-                if available_tickets:
-                    print(f"✓ TICKETS AVAILABLE! (Found in page 1)")
-                    for ticket in available_tickets:
+            page_count = get_cached_page_count()
+            if page_count:
+                # ページ数がキャッシュ済みなら、1ページ目を待たずに全ページを一度に並列取得
+                pending_pages = range(1, page_count + 1)
+            else:
+                # 1ページ目を取得してページ数を把握
+                first_page = fetch_page(1)
+                if isinstance(first_page, RateLimited):
+                    handle_rate_limit(first_page)
+                    return False
+                if not first_page:
+                    print(f"Error: Failed to fetch first page")
+                    return False
+
+                all_responses.append(first_page)
+                tickets = first_page.get('ticket_classes', [])
+                all_ticket_classes.extend(tickets)
+
+                # 早期終了: 1ページ目で在庫発見したら即座に返す
+                if EARLY_EXIT:
+                    ticket = find_first_available(tickets)
+                    if ticket:
+                        print(f"✓ TICKETS AVAILABLE! (Found in page 1)")
                         print(f"  → {ticket['name']}")
-                    return True
+                        return True
+                else:
+                    available_tickets.extend(collect_available_tickets(tickets))
 
-            pagination = first_page.get('pagination', {})
-            page_count = pagination.get('page_count', 1)
+                pagination = first_page.get('pagination', {})
+                page_count = pagination.get('page_count', 1)
+                cache_page_count(page_count)
 
-            # 2ページ目以降がある場合、すべてのページを同時に並列取得
-            if page_count > 1:
-                with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-                    future_to_page = {executor.submit(fetch_page, url, page): page
-                                     for page in range(2, page_count + 1)}
+                # 2ページ目以降がある場合、すべてのページを同時に並列取得
+                pending_pages = range(2, page_count + 1)
 
+            while pending_pages:
+                future_to_page = {fetch_executor.submit(fetch_page, page): page
+                                  for page in pending_pages}
+                reported_page_count = page_count
+
+                # API制限や早期終了で途中で抜ける場合は、まだ始まっていないリクエストを取り消す
+                try:
                     for future in as_completed(future_to_page):
                         data = future.result()
-                        if data:
+                        if isinstance(data, RateLimited):
+                            handle_rate_limit(data)
+                            return False
+                        if not data:
+                            failed_pages += 1
+                        else:
                             all_responses.append(data)
                             tickets = data.get('ticket_classes', [])
                             all_ticket_classes.extend(tickets)
 
-                            # 早期終了: 在庫を見つけたらすぐ返す
+                            # 応答のページ数がキャッシュと食い違っていないか確認
+                            pagination = data.get('pagination', {})
+                            reported_page_count = pagination.get('page_count', reported_page_count)
+
+                            # 早期終了: 在庫を見つけたらすぐ返す（残りのチケットは走査しない）
                             if EARLY_EXIT:
-                                for tc in tickets:
-                                    if tc.get('on_sale_status') == 'AVAILABLE':
-                                        available_tickets.append({
-                                            'id': tc['id'],
-                                            'name': tc['name'],
-                                            'on_sale_status': tc['on_sale_status']
-                                        })
-
-                                if available_tickets:
+                                ticket = find_first_available(tickets)
+                                if ticket:
                                     print(f"✓ TICKETS AVAILABLE! (Found early)")
-                                    for ticket in available_tickets:
-                                        print(f"  → {ticket['name']}")
+                                    print(f"  → {ticket['name']}")
                                     return True
+                            else:
+                                available_tickets.extend(collect_available_tickets(tickets))
+                finally:
+                    for queued in future_to_page:
+                        queued.cancel()
+
+                # ページ数が変わっていた場合はキャッシュを更新し、増えたページだけ追加で取得
+                pending_pages = range(page_count + 1, reported_page_count + 1)
+                if reported_page_count != page_count:
+                    cache_page_count(reported_page_count)
+                    page_count = reported_page_count
         else:
             # 順次取得（安全）
             page = 1
             while True:
-                data = fetch_page(url, page)
+                data = fetch_page(page)
+                if isinstance(data, RateLimited):
+                    handle_rate_limit(data)
+                    return False
                 if not data:
+                    failed_pages += 1
                     break
 
                 all_responses.append(data)
                 tickets = data.get('ticket_classes', [])
                 all_ticket_classes.extend(tickets)
 
-                # 早期終了
+                # 早期終了（最初の1件が見つかった時点で打ち切る）
                 if EARLY_EXIT:
-                    for tc in tickets:
-                        if tc.get('on_sale_status') == 'AVAILABLE':
-                            available_tickets.append({
-                                'id': tc['id'],
-                                'name': tc['name'],
-                                'on_sale_status': tc['on_sale_status']
-                            })
-
-                    if available_tickets:
+                    ticket = find_first_available(tickets)
+                    if ticket:
                         print(f"✓ TICKETS AVAILABLE!")
-                        for ticket in available_tickets:
-                            print(f"  → {ticket['name']}")
+                        print(f"  → {ticket['name']}")
                         return True
+                else:
+                    available_tickets.extend(collect_available_tickets(tickets))
 
                 pagination = data.get('pagination', {})
                 if not pagination.get('has_more_items', False):
                     break
                 page += 1
 
+        # 全ページの取得に成功した場合のみ待機時間を元に戻していく
+        if failed_pages:
+            print(f"⚠ Failed to fetch {failed_pages} page(s)")
+        else:
+            register_api_success()
+
         # JSON出力機能（ON/OFF切り替え可能）
-        if SAVE_JSON_RESPONSE:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f'response_{timestamp}.json'
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'total_tickets': len(all_ticket_classes),
-                    'pages': len(all_responses),
-                    'responses': all_responses
-                }, f, indent=2, ensure_ascii=False)
-
-        # 早期終了が無効の場合、最後に全チケットをチェック
-        if not EARLY_EXIT or not available_tickets:
-            for tc in all_ticket_classes:
-                on_sale_status = tc.get('on_sale_status', '')
-                if on_sale_status == 'AVAILABLE':
-                    available_tickets.append({
-                        'id': tc['id'],
-                        'name': tc['name'],
-                        'on_sale_status': on_sale_status
-                    })
-
-            if available_tickets:
-                print(f"✓ TICKETS AVAILABLE! ({len(available_tickets)}/{len(all_ticket_classes)})")
-                for ticket in available_tickets:
-                    print(f"  → {ticket['name']}")
-                return True
+        # 全ページが前回から変更なし（304または同じ本文）の場合は保存しない
+        if SAVE_JSON_RESPONSE and modified_pages:
+            save_json_response(all_ticket_classes, all_responses)
+
+        # 各ページの取得時に集めた在庫を報告（全チケットの再走査はしない）
+        if available_tickets:
+            print(f"✓ TICKETS AVAILABLE! ({len(available_tickets)}/{len(all_ticket_classes)})")
+            for ticket in available_tickets:
+                print(f"  → {ticket['name']}")
+            return True
 
         print(f"No tickets available. (Checked {len(all_ticket_classes)} tickets)")
         return False
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"Network error: {e}")
         return False
 
@@ -335,6 +735,22 @@ def check_ticket_availability():
 # Selenium自動操作関連の関数
 # ============================================================
 
+def wait_for_clickable(wait, locators):
+    """
+    いずれかのロケーターに一致する要素がクリック可能になるまで待機
+
+    Args:
+        wait: WebDriverWaitインスタンス
+        locators: (By, セレクタ)のリスト
+
+    Returns:
+        WebElement: 最初にクリック可能になった要素
+
+    Raises:
+        TimeoutException: 待機時間内にどの要素も見つからなかった場合
+    """
+    return wait.until(EC.any_of(*(EC.element_to_be_clickable(locator) for locator in locators)))
+
 def automate_registration(driver):
     """
     チケット予約の自動化処理
@@ -355,40 +771,17 @@ def automate_registration(driver):
         bool: 自動化が成功した場合True、失敗した場合False
     """
     try:
-        # 要素の出現を最大20秒待機
-        wait = WebDriverWait(driver, 20)
+        # 要素の出現を最大20秒待機（0.1秒間隔で確認し、表示され次第すぐに操作する）
+        wait = WebDriverWait(driver, 20, poll_frequency=0.1)
 
         # ================================================
         # Step 1: "Check availability"ボタンをクリック
         # ================================================
         print("Step 1: Clicking 'Check availability' button...")
 
-        # 複数のセレクタを試行（ページ構造の変更に対応）
-        check_availability_selectors = [
-            "button[id*='check-availability']",
-            "button.check-availability-btnbutton",
-            "button:contains('Check availability')"
-        ]
-
-        check_availability_btn = None
-        for selector in check_availability_selectors:
-            try:
-                # 各セレクタでボタンを探す
-                check_availability_btn = wait.until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                )
-                print(f"  Found button with selector: {selector}")
-                break
-            except TimeoutException:
-                # このセレクタでは見つからなかったので次を試す
-                continue
-
-        # CSSセレクタで見つからなかった場合、XPathを試す
-        if not check_availability_btn:
-            print("  Trying XPath method...")
-            check_availability_btn = wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Check availability')]"))
-            )
+        # 複数のセレクタのどれか1つが見つかった時点で進む（ページ構造の変更に対応）
+        check_availability_btn = wait_for_clickable(wait, CHECK_AVAILABILITY_LOCATORS)
+        print("  Found Check availability button")
 
         # ボタンをクリック
         check_availability_btn.click()
@@ -418,124 +811,50 @@ def automate_registration(driver):
         #print("  Waiting for calendar modal to appear...")
         #time.sleep(2)
 
-        # The calendar dates are button elements
-        # Look for buttons that are numeric (dates in calendar grid)
         available_date = None
 
-        print("  Looking for calendar date buttons...")
+        print("  Looking for calendar date...")
         try:
             # First, let's wait a bit more for the content to load
             #time.sleep(2)
 
-            # Debug: Save screenshot to see what's in the iframe
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            screenshot_path = f'iframe_screenshot_{timestamp}.png'
-            driver.save_screenshot(screenshot_path)
-            print(f"  Debug screenshot saved: {screenshot_path}")
-
-            # Try to find all buttons in the iframe
-            all_buttons = driver.find_elements(By.TAG_NAME, "button")
-            print(f"  Found {len(all_buttons)} total buttons in iframe")
-
-            # Show first few buttons for debugging
-            if all_buttons:
-                print("  Sample buttons found:")
-                for i, btn in enumerate(all_buttons[:10]):
-                    try:
-                        btn_text = btn.text.strip() if btn.text else "[no text]"
-                        btn_class = btn.get_attribute("class")
-                        print(f"    [{i}] Text: '{btn_text}', Class: '{btn_class}'")
-                    except Exception:
-                        continue
-
-            # Try to find date section with more flexible selector
-            print("  Looking for Date section...")
-            date_sections = driver.find_elements(By.XPATH, "//*[contains(text(), 'Date')]")
-            print(f"  Found {len(date_sections)} elements containing 'Date'")
-
-            # The calendar dates might not be buttons, try finding any clickable element with numeric text
-            # Try multiple approaches:
-
-            # 1. Try button elements
-            date_buttons = driver.find_elements(By.XPATH,
-                "//button[not(@disabled) and string-length(normalize-space(text())) <= 2 and number(text()) = number(text())]")
-            print(f"  Found {len(date_buttons)} button date elements")
-
-            # 2. Try any clickable element (div, span, etc.) with numeric text in calendar
-            if len(date_buttons) == 0:
-                print("  Trying non-button date elements...")
-                date_elements = driver.find_elements(By.XPATH,
-                    "//*[string-length(normalize-space(text())) <= 2 and number(text()) = number(text()) and not(contains(@class, 'disabled'))]")
-                print(f"  Found {len(date_elements)} potential date elements")
-
-                for elem in date_elements:
-                    try:
-                        if elem.is_displayed():
-                            text = elem.text.strip()
-                            tag = elem.tag_name
-                            classes = elem.get_attribute("class")
-                            print(f"    - Element: {tag}, text: '{text}', classes: '{classes}'")
-                            if text.isdigit() and int(text) <= 31:
-                                # If it's a p tag with dateText, we need to click the parent li
-                                if tag == 'p' and 'dateText' in classes:
-                                    parent = elem.find_element(By.XPATH, "./ancestor::li[1]")
-                                    parent_classes = parent.get_attribute("class")
-                                    print(f"  Found parent li with classes: '{parent_classes}'")
-
-                                    # Check if the date is available (not unavailable or disabled)
-                                    if 'unavailable' not in parent_classes.lower() and 'disabled' not in parent_classes.lower():
-                                        available_date = parent
-                                        print(f"  Selected available date: {text}")
-                                        break
-                                    else:
-                                        print(f"  Date {text} is unavailable, trying next...")
-                                        continue
-                                else:
-                                    available_date = elem
-                                    print(f"  Selected date element: {text}")
-                                    break
-                    except Exception as e:
-                        print(f"  Error checking element: {e}")
-                        continue
-
-            # 3. If still not found, try li elements (original structure)
-            if not available_date:
-                print("  Trying li elements...")
-                li_elements = driver.find_elements(By.TAG_NAME, "li")
-                print(f"  Found {len(li_elements)} li elements")
-
-                for li in li_elements:
-                    try:
-                        if li.is_displayed() and 'enabled' in li.get_attribute('class').lower():
-                            available_date = li
-                            print(f"  Found enabled li element")
-                            break
-                    except Exception:
-                        continue
+            if DEBUG:
+                # Debug: Save screenshot to see what's in the iframe
+                timestamp = time.strftime('%Y%m%d_%H%M%S')
+                screenshot_path = f'iframe_screenshot_{timestamp}.png'
+                driver.save_screenshot(screenshot_path)
+                print(f"  Debug screenshot saved: {screenshot_path}")
+
+                # Collect button count and the first few buttons in one round trip
+                button_count, sample_buttons = driver.execute_script(
+                    "const buttons = [...document.querySelectorAll('button')];"
+                    "return [buttons.length, buttons.slice(0, 10).map(b => [b.innerText.trim(), b.className])];"
+                )
+                print(f"  Found {button_count} total buttons in iframe")
+
+                # Show first few buttons for debugging
+                if sample_buttons:
+                    print("  Sample buttons found:")
+                    for i, (btn_text, btn_class) in enumerate(sample_buttons):
+                        print(f"    [{i}] Text: '{btn_text or '[no text]'}', Class: '{btn_class}'")
+
+                # Try to find date section with more flexible selector
+                print("  Looking for Date section...")
+                date_sections = driver.find_elements(By.XPATH, "//*[contains(text(), 'Date')]")
+                print(f"  Found {len(date_sections)} elements containing 'Date'")
+
+            # 利用可能な日付が描画されるまでブラウザ側で待ち、描画された瞬間に受け取る
+            # （WebDriverでポーリングせず、JavaScript 1回の呼び出しで済ませるため）
+            driver.set_script_timeout(DATE_WAIT_TIMEOUT + 5)
+            available_date = driver.execute_async_script(WAIT_FOR_AVAILABLE_DATE_SCRIPT, DATE_WAIT_TIMEOUT * 1000)
+            if available_date:
+                print("  Found available date")
 
         except Exception as e:
             print(f"  Error finding date buttons: {e}")
-            import traceback
-            traceback.print_exc()
-
-        if not available_date:
-            # Try alternative: look for any button in the calendar area
-            print("  Trying alternative method...")
-            try:
-                # Look for buttons within a table or grid structure (common for calendars)
-                date_buttons = driver.find_elements(By.CSS_SELECTOR, "table button, [role='grid'] button, [class*='calendar'] button")
-                print(f"  Found {len(date_buttons)} buttons in calendar area")
-
-                for btn in date_buttons:
-                    try:
-                        if btn.is_displayed() and btn.is_enabled() and btn.text.strip().isdigit():
-                            available_date = btn
-                            print(f"  Found date: {btn.text}")
-                            break
-                    except Exception:
-                        continue
-            except Exception as e:
-                print(f"  Alternative method failed: {e}")
+            if DEBUG:
+                import traceback
+                traceback.print_exc()
 
         if not available_date:
             raise TimeoutException("Could not find available date button")
@@ -546,25 +865,8 @@ def automate_registration(driver):
 
         # Step 3: Select time slot
         print("Step 3: Selecting time slot...")
-        time_slot_selectors = [
-            "div[role='button'][class*='TimeSlot']",
-            "div.TimeSlot-moduleslot_1Z-Kw",
-            "div[class*='timeSlotContainer']"
-        ]
-
-        time_slot = None
-        for selector in time_slot_selectors:
-            try:
-                time_slot = wait.until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                )
-                print(f"  Found time slot with selector: {selector}")
-                break
-            except TimeoutException:
-                continue
-
-        if not time_slot:
-            raise TimeoutException("Could not find time slot")
+        time_slot = wait_for_clickable(wait, TIME_SLOT_LOCATORS)
+        print("  Found time slot")
 
         time_slot.click()
         print("  ✓ Selected time slot")
@@ -575,28 +877,8 @@ def automate_registration(driver):
 
         # Step 5: Click "Register" button
         print("Step 5: Clicking 'Register' button...")
-        register_selectors = [
-            "button[data-testid='eds-modal__primary-button']",
-            "button[data-automation='eds-modalprimary-button']",
-            "button.eds-btn--fill"
-        ]
-
-        register_btn = None
-        for selector in register_selectors:
-            try:
-                register_btn = wait.until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                )
-                print(f"  Found register button with selector: {selector}")
-                break
-            except TimeoutException:
-                continue
-
-        if not register_btn:
-            print("  Trying XPath method...")
-            register_btn = wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Register')]"))
-            )
+        register_btn = wait_for_clickable(wait, REGISTER_LOCATORS)
+        print("  Found register button")
 
         register_btn.click()
         print("  ✓ Clicked Register button")
@@ -613,7 +895,7 @@ def automate_registration(driver):
 
         # Save screenshot for debugging
         try:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            timestamp = time.strftime('%Y%m%d_%H%M%S')
             screenshot_path = f'error_screenshot_{timestamp}.png'
             driver.save_screenshot(screenshot_path)
             print(f"  Screenshot saved: {screenshot_path}")
@@ -634,12 +916,28 @@ def automate_registration(driver):
 # ブラウザ操作関連の関数
 # ============================================================
 
+def is_logged_in(driver):
+    """
+    ブラウザがEventbriteにログイン済みかどうかを確認
+
+    アカウント設定ページを開き、ログインページへリダイレクトされるかで判定します。
+
+    Args:
+        driver: Selenium WebDriverインスタンス
+
+    Returns:
+        bool: ログイン済みの場合True
+    """
+    driver.get("https://www.eventbrite.com/account-settings/")
+    return '/signin' not in driver.current_url
+
 def open_browser_and_login():
     """
     ブラウザを開いてユーザーにログインしてもらう
 
-    Chromeブラウザを起動し、Eventbriteのホームページを表示します。
-    ユーザーが手動でログインした後、Enterキーを押すとCookieを保存して
+    CHROME_PROFILE_DIRのプロファイルでChromeブラウザを起動します。
+    前回のログイン状態が残っていればそのまま監視を開始し、
+    残っていなければユーザーが手動でログインした後、Enterキーを押すと
     監視を開始します。ブラウザは開いたままにして、後の自動操作で再利用します。
 
     Returns:
@@ -655,11 +953,26 @@ def open_browser_and_login():
         options = webdriver.ChromeOptions()
         options.add_argument("--no-first-run")  # 初回起動メッセージを表示しない
         options.add_argument("--no-default-browser-check")  # デフォルトブラウザチェックをスキップ
+        options.add_argument(f"--user-data-dir={CHROME_PROFILE_DIR}")  # ログイン状態を次回以降も引き継ぐ
+        options.add_argument("--disable-features=Translate,BackForwardCache")  # 翻訳バーなど不要な機能を無効化
+        options.add_argument("--disable-background-timer-throttling")  # バックグラウンドでもタイマーを間引かない
+        options.add_argument("--disable-renderer-backgrounding")  # 非アクティブなタブの処理を遅らせない
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2  # 画像を読み込まない
+        })
+        options.page_load_strategy = 'eager'  # DOMの構築が終わった時点でdriver.getから戻る
 
         # Chromeブラウザを起動
         driver = webdriver.Chrome(options=options)
         driver.maximize_window()  # ウィンドウを最大化
 
+        # 保存済みのログイン状態が使えるか確認
+        print("Checking saved login session...")
+        if is_logged_in(driver):
+            print("\n✓ Already logged in (saved session)")
+            print("Starting ticket monitoring...\n")
+            return driver
+
         # Eventbriteのホームページを開く
         print("Opening Eventbrite...")
         driver.get("https://www.eventbrite.com")
@@ -709,9 +1022,15 @@ def purchase_attempt(driver):
         print(f"Navigating to: {CHECKOUT_BASE_URL}")
         driver.get(CHECKOUT_BASE_URL)
 
-        # ページの読み込みを待機
+        # ページの読み込みを待機（固定時間は待たず、DOMの構築が終わり次第進む）
         print("Waiting for page to load...")
-        time.sleep(3)
+        try:
+            WebDriverWait(driver, 10, poll_frequency=0.1).until(
+                lambda d: d.execute_script("return document.readyState") != "loading"
+            )
+        except TimeoutException:
+            # 読み込みが終わらなくてもボタンが表示されていれば操作できるので続行
+            print("Page is still loading, continuing...")
 
         print(f"Page loaded. Title: {driver.title}")
 
@@ -741,28 +1060,57 @@ def purchase_attempt(driver):
 # メイン処理
 # ============================================================
 
+def warm_checkout_connection(driver):
+    """
+    ブラウザからEventbriteへの接続を温め直す
+
+    開いている予約ページから同じオリジンに軽いHEADリクエストを送り、
+    ChromeのDNSキャッシュとTLS接続がアイドルで閉じられないようにします。
+    リクエストはブラウザ内で非同期に送られるため、この関数はすぐに戻ります。
+
+    Args:
+        driver: Selenium WebDriverインスタンス
+    """
+    try:
+        driver.execute_script(
+            "fetch(arguments[0], {method: 'HEAD', credentials: 'include'}).catch(() => {});",
+            CHECKOUT_BASE_URL
+        )
+    except Exception as e:
+        print(f"⚠ Failed to warm checkout connection: {e}")
+
 def main():
     """
     プログラムのメイン処理
 
     処理の流れ：
     1. ブラウザを開いてユーザーにログインしてもらう
-    2. ログイン完了後、チケットの空き状況を定期的に監視
+    2. ログイン完了後、予約ページを先読みしてからチケットの空き状況を定期的に監視
     3. 空き枠が見つかったら、同じブラウザで自動予約を実行
     4. 最後のチェックアウトをユーザーに任せる
     """
     # ステップ1: ブラウザを開いてログイン
     driver = open_browser_and_login()
 
+    # 監視中に予約ページを一度開いておく
+    # （ページの静的ファイルがブラウザ側でキャッシュされ、空き枠検出時の移動が速くなる）
+    # DNS・TLS接続は放置すると閉じられるため、監視中にwarm_checkout_connectionで定期的に温め直す
+    print(f"Preloading checkout page: {CHECKOUT_BASE_URL}")
+    try:
+        driver.get(CHECKOUT_BASE_URL)
+    except Exception as e:
+        print(f"⚠ Failed to preload checkout page: {e}")
+
     # ステップ2: チケット監視を開始
     print("=" * 60)
     print("STEP 2: Ticket Monitoring")
     print("=" * 60)
-    print(f"Monitoring Event ID: {EVENT_ID} (every {POLL_INTERVAL}s)")
+    print(f"Monitoring Event ID: {EVENT_ID} (every {POLL_INTERVAL}s, up to {BACKOFF_MAX}s on API errors)")
     print("Press Ctrl+C to stop monitoring\n")
     print("Note: Browser will stay open. Do not close it!\n")
 
     attempts = 0
+    last_warmed_at = time.monotonic()
     try:
         # 無限ループでチケット状況を監視
         while True:
@@ -779,8 +1127,13 @@ def main():
                 purchase_attempt(driver)
                 break  # 予約処理が完了したらループを抜ける
 
-            # 次のチェックまで待機
-            time.sleep(POLL_INTERVAL)
+            # 待機中にブラウザ側の予約ページへの接続を温め直す
+            if time.monotonic() - last_warmed_at >= CHECKOUT_WARM_INTERVAL:
+                warm_checkout_connection(driver)
+                last_warmed_at = time.monotonic()
+
+            # 次のチェックまで待機（API制限・エラー時は自動的に間隔が延びる）
+            time.sleep(current_interval)
 
     except KeyboardInterrupt:
         # Ctrl+Cで停止された場合